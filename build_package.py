@@ -1,34 +1,12 @@
 #!/usr/bin/env python3
 """Simple and fast build script for webcam-security package."""
 
-import subprocess
 import sys
 import os
 import shutil
 from pathlib import Path
-import time
 
-
-def run(cmd, description):
-    """Run a command and show output in real-time."""
-    print(f"🔄 {description}...")
-    start = time.time()
-
-    try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            check=True,
-            capture_output=False,  # Show output in real-time
-            text=True,
-        )
-        elapsed = time.time() - start
-        print(f"✅ {description} completed ({elapsed:.2f}s)")
-        return True
-    except subprocess.CalledProcessError as e:
-        elapsed = time.time() - start
-        print(f"❌ {description} failed ({elapsed:.2f}s)")
-        return False
+from common_run import build_command, pip_install, requirements_for, run
 
 
 def main():
@@ -45,12 +23,13 @@ def main():
 
     print("✅ Cleaned previous builds")
 
-    # Install build tools
-    if not run("pip install build", "Installing build tools"):
+    # Install build tools (nothing to do when uv builds natively)
+    requirements = requirements_for(build_command())
+    if requirements and not pip_install(requirements, "Installing build tools"):
         return False
 
     # Build package
-    if not run("python -m build", "Building package"):
+    if not run(build_command(), "Building package"):
         return False
 
     # Check built files
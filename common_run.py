@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Shared command runner for the build, release and setup scripts."""
+
+import asyncio
+import shutil
+import subprocess
+import sys
+import time
+
+
+def run(argv, description):
+    """Run a command and show output in real-time.
+
+    ``argv`` is the argument list; no shell is started and the child writes
+    straight to the terminal, so output is not buffered in memory until the
+    command finishes.
+    """
+    print(f"🔄 {description}...")
+    start = time.time()
+
+    try:
+        returncode = subprocess.Popen(argv).wait()
+    except OSError as e:
+        returncode = None
+        print(f"❌ {e}")
+
+    elapsed = time.time() - start
+    if returncode != 0:
+        print(f"❌ {description} failed ({elapsed:.2f}s)")
+        return False
+
+    print(f"✅ {description} completed ({elapsed:.2f}s)")
+    return True
+
+
+async def run_async(argv, description):
+    """Async variant of run() so independent commands can overlap."""
+    print(f"🔄 {description}...")
+    start = time.time()
+
+    try:
+        process = await asyncio.create_subprocess_exec(*argv)
+        returncode = await process.wait()
+    except OSError as e:
+        returncode = None
+        print(f"❌ {e}")
+
+    elapsed = time.time() - start
+    if returncode != 0:
+        print(f"❌ {description} failed ({elapsed:.2f}s)")
+        return False
+
+    print(f"✅ {description} completed ({elapsed:.2f}s)")
+    return True
+
+
+def run_shell(cmd, description):
+    """Run a command through /bin/sh.
+
+    Only for commands that really are shell pipelines (e.g. ``curl ... | sh``);
+    everything else should go through run().
+    """
+    print(f"🔄 {description}...")
+    start = time.time()
+
+    result = subprocess.run(cmd, shell=True, executable="/bin/sh")
+
+    elapsed = time.time() - start
+    if result.returncode != 0:
+        print(f"❌ {description} failed ({elapsed:.2f}s)")
+        return False
+
+    print(f"✅ {description} completed ({elapsed:.2f}s)")
+    return True
+
+
+def use_uv(backend=None):
+    """Return True if commands should go through uv.
+
+    ``backend`` is "uv" or "pip"; when None, uv is used if it is on PATH.
+    """
+    if backend is None:
+        return shutil.which("uv") is not None
+    return backend == "uv"
+
+
+def pip_install(packages, description, backend=None):
+    """Install packages with a single installer invocation.
+
+    Uses ``uv pip install`` for the uv backend and pip otherwise, so the
+    resolver only starts once however many packages are requested.
+    """
+    if use_uv(backend):
+        installer = ["uv", "pip", "install"]
+    else:
+        installer = [sys.executable, "-m", "pip", "install"]
+    return run([*installer, *packages], description)
+
+
+def build_command(backend=None):
+    """Return the command that builds the sdist and wheel in one invocation."""
+    if use_uv(backend):
+        # uv builds natively, no frontend has to be installed first
+        return ["uv", "build"]
+    return [sys.executable, "-m", "build"]
+
+
+def twine_command(backend=None):
+    """Return the command prefix used to run twine."""
+    if use_uv(backend):
+        # uvx runs twine from uv's tool cache, nothing to install
+        return ["uvx", "twine"]
+    return [sys.executable, "-m", "twine"]
+
+
+def bump2version_command(backend=None):
+    """Return the command prefix used to run bump2version once installed."""
+    if use_uv(backend):
+        # uv pip installs into .venv, which is not on PATH unless activated
+        return ["uv", "run", "bump2version"]
+    return [sys.executable, "-m", "bumpversion"]
+
+
+_PYTHON_TOOLS = {"build": "build>=1.2", "twine": "twine"}
+
+
+def requirements_for(*commands):
+    """Return the packages that must be installed before running commands.
+
+    Only ``<python> -m <tool>`` commands need anything, whichever interpreter
+    runs them; the uv variants above bring their own tools.
+    """
+    return [
+        _PYTHON_TOOLS[argv[2]]
+        for argv in commands
+        if argv[1:2] == ["-m"] and argv[2:3] and argv[2] in _PYTHON_TOOLS
+    ]
@@ -1,26 +1,12 @@
 #!/usr/bin/env python3
 """Fast development setup script using UV."""
 
-import subprocess
 import sys
 import os
 import shutil
 from pathlib import Path
 
-
-def run_command(cmd, description):
-    """Run a command and handle errors."""
-    print(f"🔄 {description}...")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        print(f"❌ Error: {result.stderr}")
-        return False
-
-    print(f"✅ {description} completed")
-    if result.stdout.strip():
-        print(result.stdout)
-    return True
+from common_run import run as run_command, run_shell
 
 
 def check_uv_installed():
@@ -28,12 +14,17 @@ def check_uv_installed():
     if shutil.which("uv") is None:
         print("❌ UV is not installed. Installing UV...")
         install_cmd = "curl -LsSf https://astral.sh/uv/install.sh | sh"
-        if not run_command(install_cmd, "Installing UV"):
+        if not run_shell(install_cmd, "Installing UV"):
             print(
                 "❌ Failed to install UV. Please install manually: https://docs.astral.sh/uv/getting-started/installation/"
             )
             return False
         print("✅ UV installed successfully")
+
+    # Keep the uv cache next to the project so repeated setups reuse it, and
+    # hardlink packages out of it instead of copying them
+    os.environ.setdefault("UV_CACHE_DIR", str(Path(__file__).parent / ".uv-cache"))
+    os.environ.setdefault("UV_LINK_MODE", "hardlink")
     return True
 
 
@@ -45,25 +36,30 @@ def main():
         return False
 
     # Create virtual environment with UV (much faster than venv)
-    if not run_command("uv venv", "Creating virtual environment"):
+    if not run_command(["uv", "venv"], "Creating virtual environment"):
         return False
 
     # Install dependencies with UV (uses lock file for speed)
-    if not run_command("uv pip install -e .", "Installing package in development mode"):
+    if not run_command(
+        ["uv", "pip", "install", "-e", "."], "Installing package in development mode"
+    ):
         return False
 
     # Install development dependencies
     if not run_command(
-        "uv pip install -r .dev-requirements.txt", "Installing development dependencies"
+        ["uv", "pip", "install", "-r", ".dev-requirements.txt"],
+        "Installing development dependencies",
     ):
         return False
 
     # Generate lock file for reproducible builds
-    if not run_command("uv lock", "Generating lock file"):
+    if not run_command(["uv", "lock"], "Generating lock file"):
         return False
 
     # Install pre-commit hooks
-    if not run_command("uv run pre-commit install", "Installing pre-commit hooks"):
+    if not run_command(
+        ["uv", "run", "pre-commit", "install"], "Installing pre-commit hooks"
+    ):
         print("⚠️  Pre-commit installation failed, continuing...")
 
     print("\n🎉 Development environment setup complete!")
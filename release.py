@@ -1,48 +1,104 @@
 #!/usr/bin/env python3
-"""Simple and fast release script for webcam-security package."""
+"""Simple and fast release script for webcam-security package.
 
-import subprocess
+Runs on uv by default (``uv build``, ``uvx twine``) and falls back to plain
+pip when uv is missing or ``--backend pip`` is given.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import shutil
 import sys
 import os
 import re
-import time
 from pathlib import Path
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
 
-def run(cmd, description):
-    """Run a command and show output in real-time."""
-    print(f"🔄 {description}...")
-    start = time.time()
+from common_run import (
+    build_command,
+    bump2version_command,
+    pip_install,
+    requirements_for,
+    run,
+    run_async,
+    twine_command,
+    use_uv,
+)
 
-    try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            check=True,
-            capture_output=False,  # Show output in real-time
-            text=True,
-        )
-        elapsed = time.time() - start
-        print(f"✅ {description} completed ({elapsed:.2f}s)")
-        return True
-    except subprocess.CalledProcessError as e:
-        elapsed = time.time() - start
-        print(f"❌ {description} failed ({elapsed:.2f}s)")
-        return False
+BACKENDS = ("uv", "pip")
 
+# Project version line in pyproject.toml (not target-version & co.)
+_VERSION_RE = re.compile(r'^version = "([^"]+)"', re.M)
 
-def get_version():
-    """Get current version from pyproject.toml."""
-    with open("pyproject.toml", "r") as f:
-        content = f.read()
-        match = re.search(r'version = "([^"]+)"', content)
-        if match:
-            return match.group(1)
-    return None
+# Files that carry the version, with the (prefix, suffix) around it
+_VERSION_FILES = {
+    "pyproject.toml": re.compile(r'^(version = ")[^"]+(")', re.M),
+    "setup.py": re.compile(r'^(\s*version=")[^"]+(")', re.M),
+    "src/webcam_security/__init__.py": re.compile(r'^(__version__ = ")[^"]+(")', re.M),
+}
+
+
+def select_backend(backend=None):
+    """Bind the installer and tool commands to one backend for this run."""
+    global _install, _build_argv, _twine_argv, _bump2version_argv
+    _install = functools.partial(pip_install, backend=backend)
+    _build_argv = build_command(backend)
+    _twine_argv = twine_command(backend)
+    _bump2version_argv = bump2version_command(backend)
+
+
+select_backend()
 
 
-def bump_version(bump_type):
-    """Bump version using bump2version."""
+@functools.lru_cache(maxsize=1)
+def _load_pyproject():
+    """Parse pyproject.toml once; call cache_clear() after rewriting it."""
+    content = Path("pyproject.toml").read_text()
+    if tomllib is not None:
+        return tomllib.loads(content)
+
+    match = _VERSION_RE.search(content)
+    return {"project": {"version": match.group(1) if match else None}}
+
+
+def get_version():
+    """Get current version from pyproject.toml."""
+    return _load_pyproject().get("project", {}).get("version")
+
+
+def _write_atomic(path, content):
+    """Replace a file's content without leaving it half-written."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+
+
+def _set_version(new_version):
+    """Rewrite the version in every file that carries it."""
+    changed = []
+    for name, pattern in _VERSION_FILES.items():
+        path = Path(name)
+        if not path.exists():
+            continue
+        content = path.read_text()
+        new_content, count = pattern.subn(rf"\g<1>{new_version}\g<2>", content, count=1)
+        if count == 0:
+            print(f"⚠️  No version found in {name}")
+            continue
+        if new_content != content:
+            _write_atomic(path, new_content)
+            changed.append(name)
+    return changed
+
+
+def bump_version(bump_type, legacy=False):
+    """Bump the version in place, or with bump2version if legacy is set."""
     current_version = get_version()
     if not current_version:
         print("❌ Could not determine current version")
@@ -66,81 +122,168 @@ def bump_version(bump_type):
     new_version = f"{major}.{minor}.{patch}"
     print(f"Bumping version: {current_version} -> {new_version}")
 
-    # Install bump2version if needed
-    if not run("pip install bump2version", "Installing bump2version"):
+    if legacy:
+        # Install bump2version if needed
+        if not _install(["bump2version"], "Installing bump2version"):
+            return False
+
+        # Bump version
+        cmd = [
+            *_bump2version_argv,
+            "--current-version",
+            current_version,
+            "--new-version",
+            new_version,
+            bump_type,
+        ]
+        bumped = run(cmd, f"Bumping {bump_type} version")
+        _load_pyproject.cache_clear()
+        return bumped
+
+    changed = _set_version(new_version)
+    _load_pyproject.cache_clear()
+    if "pyproject.toml" not in changed:
+        print("❌ Could not update the version in pyproject.toml")
         return False
 
-    # Bump version
-    cmd = f"bump2version --current-version {current_version} --new-version {new_version} {bump_type}"
-    return run(cmd, f"Bumping {bump_type} version")
+    message = f"Bump version: {current_version} → {new_version}"
+    return run(
+        ["git", "commit", "-m", message, *changed],
+        f"Committing version {new_version}",
+    )
 
 
 def build_package():
     """Build the package."""
-    # Clean and build
-    if os.path.exists("dist"):
-        import shutil
+    # Clean previous builds
+    for path in ("build", "dist", *glob.glob("*.egg-info")):
+        shutil.rmtree(path, ignore_errors=True)
+
+    # twine checks the artifacts during the build, install both at once
+    requirements = requirements_for(_build_argv, _twine_argv)
+    if requirements and not _install(requirements, "Installing build tools"):
+        return False
+
+    return asyncio.run(_build_and_check())
 
-        shutil.rmtree("dist")
 
-    if not run("pip install build", "Installing build tools"):
+async def _build_and_check():
+    """Build the wheel first, then check it while the sdist builds."""
+    if not await run_async([*_build_argv, "--wheel"], "Building wheel"):
         return False
 
-    if not run("python -m build", "Building package"):
+    check_wheel = asyncio.create_task(
+        run_async(
+            [*_twine_argv, "check", *glob.glob("dist/*.whl")],
+            "Checking wheel",
+        )
+    )
+    build_sdist = asyncio.create_task(
+        run_async([*_build_argv, "--sdist"], "Building sdist")
+    )
+    if not all(await asyncio.gather(check_wheel, build_sdist)):
         return False
 
-    return True
+    return await run_async(
+        [*_twine_argv, "check", *glob.glob("dist/*.tar.gz")],
+        "Checking sdist",
+    )
 
 
 def upload_to_pypi(test=False):
     """Upload to PyPI or TestPyPI."""
-    if not run("pip install twine", "Installing twine"):
+    requirements = requirements_for(_twine_argv)
+    if requirements and not _install(requirements, "Installing twine"):
         return False
 
-    if test:
-        return run(
-            "python -m twine upload dist/*",
-            "Uploading to TestPyPI",
-        )
-    else:
-        return run("python -m twine upload dist/*", "Uploading to PyPI")
+    repository, index = ("testpypi", "TestPyPI") if test else ("pypi", "PyPI")
+    if not run(
+        [*_twine_argv, "upload", "--repository", repository, *glob.glob("dist/*")],
+        f"Uploading to {index}",
+    ):
+        return False
+
+    host = "test.pypi.org" if test else "pypi.org"
+    print(f"🔗 https://{host}/project/webcam-security/")
+    return True
 
 
 def create_git_tag():
-    """Create and push git tag."""
+    """Create the local git tag for the current version."""
     version = get_version()
     if not version:
         print("❌ Could not determine version")
         return False
 
-    if not run(f"git tag v{version}", f"Creating git tag v{version}"):
-        return False
+    return run(["git", "tag", f"v{version}"], f"Creating git tag v{version}")
 
-    if not run("git push --tags", "Pushing git tags"):
-        return False
 
-    return True
+def delete_git_tag():
+    """Delete the local git tag for the current version."""
+    version = get_version()
+    return run(["git", "tag", "-d", f"v{version}"], f"Deleting git tag v{version}")
+
+
+def push_git_tags():
+    """Push git tags."""
+    return run(["git", "push", "--tags"], "Pushing git tags")
+
+
+def parse_args(argv):
+    """Split argv into positional arguments and options.
+
+    Options may appear anywhere, so ``bump --backend pip patch`` works.
+    """
+    positional = []
+    options = {"test": False, "legacy": False, "backend": None}
+    args = iter(argv)
+    for arg in args:
+        if arg == "--test":
+            options["test"] = True
+        elif arg == "--legacy":
+            options["legacy"] = True
+        elif arg == "--backend":
+            backend = next(args, None)
+            if backend not in BACKENDS:
+                print(f"❌ --backend must be one of: {', '.join(BACKENDS)}")
+                sys.exit(1)
+            options["backend"] = backend
+        else:
+            positional.append(arg)
+    return positional, options
 
 
 def main():
     """Main release function."""
-    if len(sys.argv) < 2:
+    positional, options = parse_args(sys.argv[1:])
+    if not positional:
         print("Usage: python release.py <command> [options]")
         print("\nCommands:")
         print("  build                    - Build package only")
-        print("  bump <patch|minor|major> - Bump version")
+        print("  bump <patch|minor|major> - Bump version (--legacy for bump2version)")
         print("  upload [--test]          - Upload to PyPI (or TestPyPI with --test)")
         print("  tag                      - Create and push git tag")
         print("  full [--test]            - Full release (bump, build, upload, tag)")
         print("  test                     - Test package installation")
+        print("  setup                    - Set up the development environment")
+        print("\nOptions:")
+        print("  --backend <uv|pip>       - Tooling to use (default: uv if installed)")
         return
 
-    command = sys.argv[1]
-    test_mode = "--test" in sys.argv
+    command = positional[0]
+    test_mode = options["test"]
+    legacy = options["legacy"]
+
+    backend = options["backend"]
+    if backend == "uv" and not use_uv():
+        print("❌ uv is not installed; run 'python dev-setup.py' or use --backend pip")
+        sys.exit(1)
+    select_backend(backend)
 
     print("🚀 Webcam Security Release Script")
     print(f"📦 Command: {command}")
     print(f"🧪 Test mode: {test_mode}")
+    print(f"🔧 Backend: {'uv' if use_uv(backend) else 'pip'}")
 
     if command == "build":
         if build_package():
@@ -150,11 +293,11 @@ def main():
             sys.exit(1)
 
     elif command == "bump":
-        if len(sys.argv) < 3:
+        if len(positional) < 2:
             print("❌ Please specify version type: patch, minor, or major")
             sys.exit(1)
-        version_type = sys.argv[2]
-        if bump_version(version_type):
+        version_type = positional[1]
+        if bump_version(version_type, legacy):
             new_version = get_version()
             print(f"\n🎉 Version bumped to {new_version}")
         else:
@@ -173,7 +316,7 @@ def main():
             sys.exit(1)
 
     elif command == "tag":
-        if create_git_tag():
+        if create_git_tag() and push_git_tags():
             print("\n🎉 Git tag created and pushed!")
         else:
             print("\n❌ Git tag creation failed!")
@@ -184,10 +327,10 @@ def main():
 
         # Determine bump type
         version_type = "patch"
-        if len(sys.argv) >= 3 and sys.argv[2] in ["patch", "minor", "major"]:
-            version_type = sys.argv[2]
+        if len(positional) >= 2 and positional[1] in ["patch", "minor", "major"]:
+            version_type = positional[1]
 
-        if not bump_version(version_type):
+        if not bump_version(version_type, legacy):
             print("\n❌ Version bump failed!")
             sys.exit(1)
 
@@ -195,11 +338,21 @@ def main():
             print("\n❌ Build failed!")
             sys.exit(1)
 
-        if not upload_to_pypi(test_mode):
+        # Tagging is local and independent of the upload, so overlap them;
+        # the tag is only pushed once the upload went through
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            upload_future = executor.submit(upload_to_pypi, test_mode)
+            tag_future = executor.submit(create_git_tag)
+            upload_ok = upload_future.result()
+            tag_ok = tag_future.result()
+
+        if not upload_ok:
+            if tag_ok:
+                delete_git_tag()
             print("\n❌ Upload failed!")
             sys.exit(1)
 
-        if not create_git_tag():
+        if not tag_ok or not push_git_tags():
             print("\n❌ Git tag creation failed!")
             sys.exit(1)
 
@@ -209,7 +362,7 @@ def main():
     elif command == "test":
         if build_package():
             print("\n🧪 Testing package installation...")
-            if run("pip install dist/*.whl", "Testing package installation"):
+            if _install(glob.glob("dist/*.whl"), "Testing package installation"):
                 print("\n🎉 Package test successful!")
             else:
                 print("\n❌ Package test failed!")
@@ -218,6 +371,12 @@ def main():
             print("\n❌ Build failed, cannot test!")
             sys.exit(1)
 
+    elif command == "setup":
+        if not run(
+            [sys.executable, "dev-setup.py"], "Setting up development environment"
+        ):
+            sys.exit(1)
+
     else:
         print(f"❌ Unknown command: {command}")
         sys.exit(1)
@@ -4,7 +4,20 @@ __version__ = "0.3.3"
 __author__ = "Javier Oramas"
 __email__ = "javiale2000@gmail.com"
 
-from .core import SecurityMonitor
+from typing import TYPE_CHECKING, Any
+
 from .config import Config
 
+if TYPE_CHECKING:
+    from .core import SecurityMonitor
+
 __all__ = ["SecurityMonitor", "Config"]
+
+
+def __getattr__(name: str) -> Any:
+    # core pulls in OpenCV and NumPy, so only import it once it is used
+    if name == "SecurityMonitor":
+        from .core import SecurityMonitor
+
+        return SecurityMonitor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,7 +11,6 @@ import time
 import subprocess
 
 from .config import Config
-from .core import SecurityMonitor
 from .updater import SelfUpdater
 
 app = typer.Typer(
@@ -117,6 +116,9 @@ def start() -> None:
         console.print("• Press 'q' in the preview window to stop monitoring")
         console.print("• Press Ctrl+C in terminal to stop monitoring")
 
+        # Imported here so other commands don't pay for loading OpenCV
+        from .core import SecurityMonitor
+
         monitor = SecurityMonitor(config)
         monitor.start()
 
@@ -199,6 +201,8 @@ def clean() -> None:
     """Manually clean old recording files."""
     try:
         config = Config.load()
+        from .core import SecurityMonitor
+
         monitor = SecurityMonitor(config)
 
         console.print("[yellow]Cleaning old recording files...[/yellow]")
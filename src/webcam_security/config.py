@@ -20,11 +20,17 @@ class Config:
     min_contour_area: int = 500
     motion_threshold: int = 25 
     recording_fps: float = 20.0
+    detect_every_n: int = 3  # Run motion detection on 1 of N frames while idle
+    capture_width: int = 1280
+    capture_height: int = 720
+    video_fourcc: str = "XVID"  # "MJPG" uses less CPU but ~8x larger files
+    hardware_encoding: bool = True  # Use a GStreamer H.264 encoder if available
     cleanup_days: int = 3
     force_monitoring: bool = False  # Force monitoring regardless of time
     device_identifier: Optional[str] = None  # Custom identifier for media messages
     media_storage_path: Optional[str] = None  # Custom path for storing media files
     headless: bool = False  # Run without GUI preview
+    use_opencl: bool = False  # Run motion detection through OpenCL if available
 
     @classmethod
     def load(cls) -> "Config":
@@ -1,20 +1,18 @@
 """Core security monitoring functionality."""
 
 import cv2
-import imutils
+import numpy as np
 import threading
 import time
+import queue
 import os
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple, Union
 import signal
 import sys
 import subprocess
-import sounddevice as sd
-import soundfile as sf
-import ffmpeg
 import socket
 
 # Optional audio imports
@@ -43,35 +41,111 @@ except ImportError:
 from .config import Config
 from .telegram_bot import TelegramBotHandler
 
+# An upload callable and its arguments, run by a Telegram worker
+_UploadJob = Tuple[Callable[..., None], tuple]
+
 
 class SecurityMonitor:
     """Main security monitoring class."""
 
+    # Width of the frames motion detection runs on
+    DETECTION_WIDTH = 256
+    # Width the area/threshold settings were tuned for
+    REFERENCE_WIDTH = 500
+    # Width of the frames buffered for the Telegram motion clip
+    CLIP_WIDTH = 500
+    # GStreamer H.264 encoders tried for recordings, VAAPI, NVENC, V4L2 M2M
+    HW_ENCODERS = ("vaapih264enc", "nvh264enc", "v4l2h264enc")
+    # (connect, read) timeouts for Telegram uploads
+    PHOTO_TIMEOUT = (3, 10)
+    VIDEO_TIMEOUT = (3, 120)
+    # Seconds stop() waits for queued uploads before giving up on them
+    SHUTDOWN_TIMEOUT = 10
+    # Seconds a monitoring-hours check is reused
+    MONITORING_CACHE_SECONDS = 30
+    # Seconds between cleanups of old recordings
+    CLEANUP_INTERVAL = 24 * 60 * 60
+
     def __init__(self, config: Config):
         self.config = config
         self.running = False
+        # Set by stop() to cut short any wait in the monitoring loop
+        self._stop_event = threading.Event()
         self.cap: Optional[cv2.VideoCapture] = None
         self.out: Optional[cv2.VideoWriter] = None
-        self.cleaner_thread: Optional[threading.Thread] = None
         self.audio_recording = False
         self.audio_thread: Optional[threading.Thread] = None
         self.telegram_bot: Optional[TelegramBotHandler] = None
         self._manual_photo_requested = False
 
+        # Uploads are handed to workers so the capture loop never blocks on
+        # the network; videos get their own queue so a long upload cannot
+        # hold up photos. Each worker keeps its own persistent session, since
+        # requests.Session is not documented as safe to share across threads
+        self._tg_queue: queue.Queue[Optional[_UploadJob]] = queue.Queue(maxsize=4)
+        self._tg_video_queue: queue.Queue[Optional[_UploadJob]] = queue.Queue(maxsize=2)
+        self._tg_workers: Dict[queue.Queue, threading.Thread] = {}
+        self._tg_lock = threading.Lock()
+        self._tg_url = f"https://api.telegram.org/bot{config.bot_token}"
+        self._http = self._new_http_session()
+        self._http_video = self._new_http_session()
+
+        # Latest webcam frame, written by the capture thread
+        self._frame_lock = threading.Lock()
+        self._latest_frame: Optional[np.ndarray] = None
+        self._frame_seq = 0
+        self._frame_ready = threading.Event()
+        self._capturing = False
+        self._capture_failed = False
+        self._capture_thread: Optional[threading.Thread] = None
+
+        # Motion detection state, (re)allocated on the first frame
+        # Running average, a UMat while motion detection runs on OpenCL
+        self._avg: Optional[Union[np.ndarray, cv2.UMat]] = None
+        self._small: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        self._thresh: Optional[np.ndarray] = None
+        self._avg_abs: Optional[np.ndarray] = None
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._use_opencl = False
+        self._monitoring_cached = False
+        self._monitoring_checked_at = float("-inf")
+        self._detect_size: Tuple[int, int] = (0, 0)
+        self._delta: Optional[np.ndarray] = None
+        self._labels: Optional[np.ndarray] = None
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self._kernel_umat: Optional[cv2.UMat] = None
+        # Software codec, probed on first use by _get_fourcc()
+        self._fourcc: Optional[int] = None
+        self._encoder_pipeline: Optional[str] = None
+        self._status_overlays: Dict[
+            str, Tuple[np.ndarray, np.ndarray, Tuple[int, int]]
+        ] = {}
+
     def is_monitoring_hours(self) -> bool:
         """Check if current time is between monitoring hours."""
         # If force monitoring is enabled, always return True
         if self.config.force_monitoring:
             return True
 
+        # The schedule only changes on the hour, so the result is reused for
+        # a while instead of being recomputed on every frame
+        now = time.monotonic()
+        if now - self._monitoring_checked_at < self.MONITORING_CACHE_SECONDS:
+            return self._monitoring_cached
+
         current_hour = datetime.now().hour
         start_hour = self.config.monitoring_start_hour
         end_hour = self.config.monitoring_end_hour
 
         if start_hour > end_hour:  # Crosses midnight
-            return current_hour >= start_hour or current_hour < end_hour
+            result = current_hour >= start_hour or current_hour < end_hour
         else:
-            return start_hour <= current_hour < end_hour
+            result = start_hour <= current_hour < end_hour
+
+        self._monitoring_cached = result
+        self._monitoring_checked_at = now
+        return result
 
     def get_device_identifier(self) -> str:
         """Get device identifier, using hostname if not specified."""
@@ -94,49 +168,131 @@ class SecurityMonitor:
             except Exception as e:
                 print(f"[ERROR] Failed to send Telegram error notification: {e}")
 
-    def send_telegram_photo(self, image_path: str, caption: str = "Motion detected!") -> None:
-        """Send photo to Telegram."""
+    def send_telegram_photo(
+        self, frame: np.ndarray, caption: str = "Motion detected!"
+    ) -> None:
+        """Encode a frame as JPEG in memory and queue it for upload to Telegram."""
         try:
             device_id = self.get_device_identifier()
             enhanced_caption = f"🚨 {caption}\n\nDevice: {device_id}\nTime: {datetime.now().strftime('%H:%M:%S')}"
 
-            url = f"https://api.telegram.org/bot{self.config.bot_token}/sendPhoto"
-            with open(image_path, "rb") as photo:
-                files = {"photo": photo}
-                data = {
-                    "chat_id": self.config.chat_id,
-                    "caption": enhanced_caption,
-                }
-                if self.config.topic_id:
-                    data["message_thread_id"] = str(self.config.topic_id)
-
-                response = requests.post(url, files=files, data=data)
-                if response.status_code != 200:
-                    error_msg = f"Telegram send failed: {response.text}"
-                    print(f"[ERROR] {error_msg}")
-                    self.notify_error(error_msg, context="send_telegram_photo")
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            if not ok:
+                raise RuntimeError("JPEG encoding failed")
+            photo_bytes = buf.tobytes()
         except Exception as e:
             error_msg = f"Telegram send failed: {e}"
             print(f"[ERROR] {error_msg}")
             self.notify_error(str(e), context="send_telegram_photo")
+            return
 
-    def send_telegram_video(self, video_path: str, caption: str = "Motion detected video!") -> None:
-        """Send video to Telegram."""
+        self._ensure_telegram_worker(self._tg_queue)
         try:
-            device_id = self.get_device_identifier()
-            enhanced_caption = f"🎥 {caption}\n\nDevice: {device_id}\nTime: {datetime.now().strftime('%H:%M:%S')}"
+            self._tg_queue.put_nowait(
+                (self._post_telegram_photo, (photo_bytes, enhanced_caption))
+            )
+        except queue.Full:
+            print("[WARNING] Telegram upload queue is full, dropping photo")
 
-            url = f"https://api.telegram.org/bot{self.config.bot_token}/sendVideo"
+    def _post_telegram_photo(self, photo: bytes, caption: str) -> None:
+        """Upload photo bytes to Telegram."""
+        try:
+            url = f"{self._tg_url}/sendPhoto"
+            files = {"photo": ("photo.jpg", photo, "image/jpeg")}
+            data = {
+                "chat_id": self.config.chat_id,
+                "caption": caption,
+            }
+            if self.config.topic_id:
+                data["message_thread_id"] = str(self.config.topic_id)
+
+            response = self._http.post(
+                url, files=files, data=data, timeout=self.PHOTO_TIMEOUT
+            )
+            if response.status_code != 200:
+                error_msg = f"Telegram send failed: {response.text}"
+                print(f"[ERROR] {error_msg}")
+                self.notify_error(error_msg, context="send_telegram_photo")
+        except Exception as e:
+            error_msg = f"Telegram send failed: {e}"
+            print(f"[ERROR] {error_msg}")
+            self.notify_error(str(e), context="send_telegram_photo")
+
+    @staticmethod
+    def _new_http_session() -> requests.Session:
+        """Create a session holding one keep-alive connection to Telegram."""
+        session = requests.Session()
+        session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1),
+        )
+        return session
+
+    def _ensure_telegram_worker(self, jobs: queue.Queue) -> None:
+        """Start the upload worker for a queue if it is not running."""
+        with self._tg_lock:
+            worker = self._tg_workers.get(jobs)
+            if worker is None or not worker.is_alive():
+                worker = threading.Thread(
+                    target=self._telegram_worker, args=(jobs,), daemon=True
+                )
+                self._tg_workers[jobs] = worker
+                worker.start()
+
+    def _telegram_worker(self, jobs: queue.Queue) -> None:
+        """Run uploads from a queue until a None sentinel is received."""
+        while True:
+            item = jobs.get()
+            if item is None:
+                break
+            upload, args = item
+            upload(*args)
+
+    def send_telegram_video(
+        self,
+        video_path: str,
+        caption: str = "Motion detected video!",
+        delete_after: bool = False,
+    ) -> None:
+        """Queue a video file for upload to Telegram.
+
+        If delete_after is set the file is removed once the upload has been
+        attempted, or straight away if it cannot be queued.
+        """
+        device_id = self.get_device_identifier()
+        enhanced_caption = f"🎥 {caption}\n\nDevice: {device_id}\nTime: {datetime.now().strftime('%H:%M:%S')}"
+
+        self._ensure_telegram_worker(self._tg_video_queue)
+        try:
+            self._tg_video_queue.put_nowait(
+                (
+                    self._post_telegram_video,
+                    (video_path, enhanced_caption, delete_after),
+                )
+            )
+        except queue.Full:
+            print(f"[WARNING] Telegram upload queue is full, not sending {video_path}")
+            if delete_after:
+                self._remove_file(video_path)
+
+    def _post_telegram_video(
+        self, video_path: str, caption: str, delete_after: bool
+    ) -> None:
+        """Upload a video file to Telegram."""
+        try:
+            url = f"{self._tg_url}/sendVideo"
             with open(video_path, "rb") as video:
                 files = {"video": video}
                 data = {
                     "chat_id": self.config.chat_id,
-                    "caption": enhanced_caption,
+                    "caption": caption,
                 }
                 if self.config.topic_id:
                     data["message_thread_id"] = str(self.config.topic_id)
 
-                response = requests.post(url, files=files, data=data)
+                response = self._http_video.post(
+                    url, files=files, data=data, timeout=self.VIDEO_TIMEOUT
+                )
                 if response.status_code != 200:
                     error_msg = f"Telegram video send failed: {response.text}"
                     print(f"[ERROR] {error_msg}")
@@ -145,6 +301,20 @@ class SecurityMonitor:
             error_msg = f"Telegram video send failed: {e}"
             print(f"[ERROR] {error_msg}")
             self.notify_error(str(e), context="send_telegram_video")
+        finally:
+            if delete_after:
+                self._remove_file(video_path)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """Remove a file that has been uploaded."""
+        try:
+            os.remove(path)
+            print(f"[INFO] Deleted uploaded file: {path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[ERROR] Failed to remove {path}: {e}")
 
     def clean_old_files(self, days_to_keep: Optional[int] = None) -> None:
         """Clean old recording files."""
@@ -152,48 +322,33 @@ class SecurityMonitor:
             days_to_keep = self.config.cleanup_days
 
         media_dir = self.config.get_media_storage_path()
-        recording_files = list(media_dir.glob("recording_*.mp4"))
-        temp_video_files = list(media_dir.glob("temp_video_*.avi"))
-        temp_audio_files = list(media_dir.glob("temp_audio_*.wav"))
-
-        # Combine and sort all files by creation time
-        all_files = recording_files + temp_video_files + temp_audio_files
-        all_files.sort(key=lambda x: x.stat().st_ctime)
-
         current_time = time.time()
         threshold_time = current_time - (days_to_keep * 24 * 60 * 60)
 
-        for file in all_files:
-            if file.stat().st_ctime < threshold_time:
+        # Single directory pass; names are filtered before anything is stat'ed
+        with os.scandir(media_dir) as entries:
+            for entry in entries:
+                if not self._is_recording_file(entry.name) or not entry.is_file():
+                    continue
+                if entry.stat().st_ctime >= threshold_time:
+                    continue
                 try:
-                    file.unlink()
-                    print(f"[INFO] Removed old file: {file}")
-                except Exception as e:
-                    error_msg = f"Failed to remove {file}: {e}"
+                    os.unlink(entry.path)
+                    print(f"[INFO] Removed old file: {entry.path}")
+                except OSError as e:
+                    error_msg = f"Failed to remove {entry.path}: {e}"
                     print(f"[ERROR] {error_msg}")
-                    self.notify_error(str(e), context=f"clean_old_files: {file}")
-
-    def clean_old_files_scheduler(self) -> None:
-        """Scheduler for cleaning old files."""
-        while self.running:
-            try:
-                now = datetime.now()
-                # Calculate next 6am
-                next_run = now.replace(hour=6, minute=0, second=0, microsecond=0)
-                if now >= next_run:
-                    # If it's already past 6am today, schedule for tomorrow
-                    next_run += timedelta(days=1)
-
-                sleep_seconds = (next_run - now).total_seconds()
-                time.sleep(sleep_seconds)
-
-                if self.running:
-                    self.clean_old_files()
-            except Exception as e:
-                error_msg = f"Cleanup scheduler error: {e}"
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(str(e), context="clean_old_files_scheduler")
-                time.sleep(60)  # Wait a minute before retrying
+                    self.notify_error(str(e), context=f"clean_old_files: {entry.path}")
+
+    @staticmethod
+    def _is_recording_file(name: str) -> bool:
+        """Check if a file name belongs to a recording or its temporary parts."""
+        return (
+            (name.startswith("recording_") and name.endswith((".mp4", ".avi")))
+            or (name.startswith("temp_video_") and name.endswith((".avi", ".mp4")))
+            or (name.startswith("temp_audio_") and name.endswith(".wav"))
+            or (name.startswith("motion_clip_") and name.endswith(".avi"))
+        )
 
     def _record_audio(self, audio_path: str) -> None:
         """Record audio in a separate thread."""
@@ -269,7 +424,327 @@ class SecurityMonitor:
             self.notify_error(str(e), context="_merge_audio_video")
             # If merging fails, keep the original files
             if os.path.exists(self.video_path):
-                os.rename(self.video_path, self.final_path.replace(".mp4", ".avi"))
+                container = os.path.splitext(self.video_path)[1]
+                os.rename(
+                    self.video_path, os.path.splitext(self.final_path)[0] + container
+                )
+
+    @staticmethod
+    def _scaled_size(frame: np.ndarray, width: int) -> Tuple[int, int]:
+        """Return the (width, height) of a frame resized to the given width."""
+        height = max(1, round(frame.shape[0] * width / frame.shape[1]))
+        return width, height
+
+    def _detect_motion(self, frame: np.ndarray) -> Optional[bool]:
+        """Update the background model with a frame and report motion.
+
+        Detection runs on a downsampled copy so the full-resolution frame can
+        be recorded untouched. Returns None while the background model is
+        being initialized.
+        """
+        # The camera resolution is fixed, so sizes and buffers are only
+        # recomputed when the incoming frame shape changes
+        if frame.shape != self._frame_shape:
+            self._frame_shape = frame.shape
+            self._detect_size = self._scaled_size(frame, self.DETECTION_WIDTH)
+            self._small = np.empty(
+                (*self._detect_size[::-1], *frame.shape[2:]), dtype=frame.dtype
+            )
+            self._gray = np.empty(self._detect_size[::-1], dtype=np.uint8)
+            self._thresh = np.empty_like(self._gray)
+            self._avg_abs = np.empty_like(self._gray)
+            self._delta = np.empty_like(self._gray)
+            self._labels = np.empty(self._gray.shape, dtype=np.int32)
+            self._avg = None
+
+        thresh: Optional[Union[np.ndarray, cv2.UMat]]
+        if self._use_opencl:
+            try:
+                thresh = self._motion_mask_opencl(frame)
+            except cv2.error as e:
+                print(f"[WARNING] OpenCL motion detection failed, using the CPU: {e}")
+                self._use_opencl = False
+                self._avg = None
+                return None
+        else:
+            thresh = self._motion_mask(frame)
+        if thresh is None:
+            return None
+
+        # min_contour_area is expressed for the former 500px-wide frames
+        scale = self.DETECTION_WIDTH / self.REFERENCE_WIDTH
+        min_area = max(1, round(self.config.min_contour_area * scale * scale))
+
+        # A quiet frame cannot contain a large enough blob, skip labelling
+        if cv2.countNonZero(thresh) < min_area:
+            return False
+
+        mask = thresh.get() if isinstance(thresh, cv2.UMat) else thresh
+        # Only the label image is frame-sized; stats grow with the blob count
+        _, _, stats, _ = cv2.connectedComponentsWithStats(
+            mask, labels=self._labels, connectivity=8
+        )
+        # Row 0 is the background component
+        return bool(np.any(stats[1:, cv2.CC_STAT_AREA] >= min_area))
+
+    def _motion_mask(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Return the dilated foreground mask of a frame, computed on the CPU."""
+        small = cv2.resize(
+            frame, self._detect_size, dst=self._small, interpolation=cv2.INTER_AREA
+        )
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        # A 7x7 box has the same spread as the former 11x11 Gaussian at this
+        # width, so motion_threshold keeps its meaning, at a fraction of the cost
+        gray = cv2.blur(gray, (7, 7), dst=self._gray)
+
+        if not isinstance(self._avg, np.ndarray):
+            self._avg = gray.astype("float")
+            return None
+
+        cv2.accumulateWeighted(gray, self._avg, 0.5)
+        avg_abs = cv2.convertScaleAbs(self._avg, dst=self._avg_abs)
+        frame_delta = cv2.absdiff(gray, avg_abs, dst=self._delta)
+
+        thresh = cv2.threshold(
+            frame_delta,
+            self.config.motion_threshold,
+            255,
+            cv2.THRESH_BINARY,
+            dst=self._thresh,
+        )[1]
+        thresh = cv2.dilate(thresh, self._kernel, dst=self._thresh, iterations=2)
+        return thresh
+
+    def _motion_mask_opencl(self, frame: np.ndarray) -> Optional[cv2.UMat]:
+        """Same as _motion_mask, but on UMats so OpenCV can run it via OpenCL.
+
+        The mask stays on the device; it is only downloaded when it has to
+        be labelled.
+        """
+        small: cv2.UMat = cv2.resize(
+            self._to_umat(frame), self._detect_size, interpolation=cv2.INTER_AREA
+        )
+        gray: cv2.UMat = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        gray = cv2.blur(gray, (7, 7))
+
+        if not isinstance(self._avg, cv2.UMat):
+            self._avg = self._to_umat(gray.get().astype("float32"))
+            return None
+
+        cv2.accumulateWeighted(gray, self._avg, 0.5)
+        frame_delta: cv2.UMat = cv2.absdiff(gray, cv2.convertScaleAbs(self._avg))
+        thresh: cv2.UMat = cv2.threshold(
+            frame_delta, self.config.motion_threshold, 255, cv2.THRESH_BINARY
+        )[1]
+        if self._kernel_umat is None:
+            self._kernel_umat = self._to_umat(self._kernel)
+        mask: cv2.UMat = cv2.dilate(thresh, self._kernel_umat, iterations=2)
+        return mask
+
+    @staticmethod
+    def _to_umat(array: np.ndarray) -> cv2.UMat:
+        """Upload an array to a UMat (the OpenCV stubs lack this overload)."""
+        umat: cv2.UMat = cv2.UMat(array)  # type: ignore[call-overload]
+        return umat
+
+    def _init_opencl(self) -> bool:
+        """Enable OpenCL for motion detection if configured and available."""
+        if not self.config.use_opencl:
+            return False
+        if not cv2.ocl.haveOpenCL():
+            print("[WARNING] OpenCL not available, motion detection runs on the CPU")
+            return False
+        cv2.ocl.setUseOpenCL(True)
+        print("[INFO] Motion detection uses OpenCL")
+        return True
+
+    def _select_fourcc(self) -> int:
+        """Return the configured video codec if the local OpenCV build can write it.
+
+        XVID is the default: recordings are uploaded to Telegram, and MJPG
+        files are several times larger (the Bot API caps videos at 50 MB).
+        MJPG is opt-in for devices where XVID encoding costs too much CPU.
+        """
+        requested = self.config.video_fourcc
+        if len(requested) != 4:
+            print(
+                f"[WARNING] video_fourcc must be 4 characters, got {requested!r}; "
+                "using MJPG"
+            )
+            requested = "MJPG"
+
+        probe_path = str(self.config.get_media_storage_path() / "codec_probe.avi")
+        candidates = dict.fromkeys((requested, "XVID", "MJPG"))
+        try:
+            for code in candidates:
+                fourcc = cv2.VideoWriter.fourcc(*code)
+                writer = cv2.VideoWriter(
+                    probe_path, fourcc, self.config.recording_fps, (64, 64)
+                )
+                opened = writer.isOpened()
+                writer.release()
+                if opened:
+                    print(f"[INFO] Encoding video with {code} codec")
+                    return fourcc
+        finally:
+            if os.path.exists(probe_path):
+                os.remove(probe_path)
+
+        print("[WARNING] No video codec could be verified, falling back to XVID")
+        return cv2.VideoWriter.fourcc(*"XVID")
+
+    def _get_fourcc(self) -> int:
+        """Return the software codec, probing it the first time it is needed.
+
+        Deferred so nothing is probed or logged while the hardware encoder
+        handles recordings and no motion clip has been written yet.
+        """
+        if self._fourcc is None:
+            self._fourcc = self._select_fourcc()
+        return self._fourcc
+
+    def _select_encoder_pipeline(self) -> Optional[str]:
+        """Return a GStreamer pipeline for hardware H.264 encoding, if any.
+
+        The first encoder element that the local GStreamer can start is used;
+        the returned template takes the output file as ``location``. The MP4
+        is fragmented every second, so a recording cut off by a crash or
+        power loss stays playable up to the last fragment.
+        """
+        if not self.config.hardware_encoding:
+            return None
+
+        probe_path = str(self.config.get_media_storage_path() / "encoder_probe.mp4")
+        try:
+            for encoder in self.HW_ENCODERS:
+                pipeline = (
+                    f"appsrc ! videoconvert ! {encoder} ! h264parse"
+                    " ! mp4mux fragment-duration=1000"
+                    ' ! filesink location="{location}"'
+                )
+                writer = cv2.VideoWriter(
+                    pipeline.format(location=probe_path),
+                    cv2.CAP_GSTREAMER,
+                    0,
+                    self.config.recording_fps,
+                    (64, 64),
+                )
+                opened = writer.isOpened()
+                writer.release()
+                if opened:
+                    print(f"[INFO] Recording with {encoder} hardware encoder")
+                    return pipeline
+        finally:
+            if os.path.exists(probe_path):
+                os.remove(probe_path)
+
+        return None
+
+    def _open_video_writer(
+        self, path: str, size: Tuple[int, int]
+    ) -> Tuple[cv2.VideoWriter, str]:
+        """Open the recording writer, on the hardware encoder when available.
+
+        Returns the writer and the path it writes, which ends in .mp4 when
+        the hardware pipeline is used.
+        """
+        if self._encoder_pipeline is not None:
+            hw_path = os.path.splitext(path)[0] + ".mp4"
+            writer = cv2.VideoWriter(
+                self._encoder_pipeline.format(location=hw_path),
+                cv2.CAP_GSTREAMER,
+                0,
+                self.config.recording_fps,
+                size,
+            )
+            if writer.isOpened():
+                return writer, hw_path
+            writer.release()
+            print("[WARNING] Hardware encoder failed, recording with software codec")
+            self._encoder_pipeline = None
+
+        writer = cv2.VideoWriter(
+            path, self._get_fourcc(), self.config.recording_fps, size
+        )
+        return writer, path
+
+    def _draw_status(
+        self, frame: np.ndarray, text: str, color: Tuple[int, int, int]
+    ) -> None:
+        """Stamp a status label onto the frame from a pre-rendered sprite.
+
+        Each label is rasterized once; later frames only copy its pixels.
+        """
+        overlay = self._status_overlays.get(text)
+        if overlay is None:
+            font, scale, thickness = cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2
+            (width, height), baseline = cv2.getTextSize(text, font, scale, thickness)
+            pad = thickness
+            size = (height + baseline + 2 * pad, width + 2 * pad)
+            origin = (pad, height + pad)
+            sprite = np.zeros((*size, 3), dtype=np.uint8)
+            coverage = np.zeros(size, dtype=np.uint8)
+            cv2.putText(sprite, text, origin, font, scale, color, thickness)
+            cv2.putText(coverage, text, origin, font, scale, 255, thickness)
+            # Anti-aliased edges are snapped to the nearer of text/background
+            mask = np.where(coverage >= 128, 255, 0).astype(np.uint8)
+            overlay = (sprite, mask, origin)
+            self._status_overlays[text] = overlay
+
+        sprite, mask, origin = overlay
+        # Same placement as putText at (10, 30)
+        top, left = 30 - origin[1], 10 - origin[0]
+        roi = frame[top : top + sprite.shape[0], left : left + sprite.shape[1]]
+        rows, cols = roi.shape[:2]
+        cv2.copyTo(sprite[:rows, :cols], mask[:rows, :cols], roi)
+
+    def _capture_frames(self) -> None:
+        """Keep the most recent webcam frame available for the detection loop."""
+        while self.running and self._capturing and self.cap is not None:
+            ret, frame = self.cap.read()
+            if not ret:
+                self._capture_failed = True
+                self._frame_ready.set()
+                break
+            with self._frame_lock:
+                self._latest_frame = frame
+                self._frame_seq += 1
+            self._frame_ready.set()
+
+    def get_latest_frame(self) -> Optional[np.ndarray]:
+        """Return a copy of the most recent webcam frame, if any."""
+        # Copy under the lock so a reader never sees a half-published frame
+        with self._frame_lock:
+            return None if self._latest_frame is None else self._latest_frame.copy()
+
+    def _open_capture(self) -> cv2.VideoCapture:
+        """Open the webcam asking for compressed MJPG frames.
+
+        MJPG lets the camera compress on-device instead of streaming raw YUYV
+        over USB, which allows higher and steadier frame rates.
+        """
+        if sys.platform.startswith("linux"):
+            cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
+        elif sys.platform == "win32":
+            cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        else:
+            cap = cv2.VideoCapture(0)
+
+        if not cap.isOpened():
+            # Fall back to whatever backend OpenCV picks by default
+            cap.release()
+            cap = cv2.VideoCapture(0)
+        if not cap.isOpened():
+            return cap
+
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.capture_width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.capture_height)
+        # Recordings are written at recording_fps, so capture at the same rate
+        cap.set(cv2.CAP_PROP_FPS, float(self.config.recording_fps))
+        # Only keep the newest frame so a slow iteration never reads stale ones
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
 
     def motion_detector(self) -> None:
         """Main motion detection loop."""
@@ -282,14 +757,15 @@ class SecurityMonitor:
         while self.cap is None or not self.cap.isOpened():
             if self.cap is not None:
                 self.cap.release()
-            self.cap = cv2.VideoCapture(0)
+            self.cap = self._open_capture()
             if self.cap.isOpened():
                 break
             if waited == 0:
                 print(
                     "[INFO] Waiting for webcam access. Please allow camera permission if prompted..."
                 )
-            time.sleep(wait_interval)
+            if self._stop_event.wait(wait_interval):
+                return
             waited += wait_interval
             if waited >= max_wait_time:
                 error_msg = "Could not open webcam after waiting for permission."
@@ -297,63 +773,72 @@ class SecurityMonitor:
                 self.notify_error(error_msg, context="motion_detector: webcam access")
                 return
 
-        time.sleep(2)
+        # Give the camera a moment to settle its exposure
+        if self._stop_event.wait(2):
+            return
 
-        avg = None
+        self._fourcc = None
+        self._encoder_pipeline = self._select_encoder_pipeline()
+        self._use_opencl = self._init_opencl()
+        self._avg = None
+        next_cleanup = 0.0  # Clean up old recordings on the first idle tick
         recording = False
         motion_timer = None
         telegram_sent = False
         motion_start_time = None
         motion_frames = []
         start_image_saved = False
-        end_image_path = None
         first_motion_time = None
         second_image_taken = False
-        start_image_saved = False
-        end_image_path = None
+        last_frame_seq = 0
+        frame_idx = 0
+        # Last frame processed, None if stopped before the first one arrived
+        last_frame: Optional[np.ndarray] = None
+        motion_detected: Optional[bool] = False
+
+        # Read the webcam on its own thread so capture overlaps processing
+        self._capturing = True
+        self._capture_failed = False
+        self._frame_ready.clear()
+        self._capture_thread = threading.Thread(
+            target=self._capture_frames, daemon=True
+        )
+        self._capture_thread.start()
 
         while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
-                error_msg = "Could not read frame"
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(error_msg, context="motion_detector: read frame")
-                break
-
-            frame = imutils.resize(frame, width=500)
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
-
-            if avg is None:
-                avg = gray.copy().astype("float")
+            # Sleep until the capture thread publishes a frame; the timeout
+            # only bounds how long a stop() can go unnoticed
+            if not self._frame_ready.wait(timeout=0.5) and not self._capture_failed:
                 continue
-
-            cv2.accumulateWeighted(gray, avg, 0.5)
-            frame_delta = cv2.absdiff(gray, cv2.convertScaleAbs(avg))
-
-            thresh = cv2.threshold(
-                frame_delta, self.config.motion_threshold, 255, cv2.THRESH_BINARY
-            )[1]
-            # Fix: Use proper kernel for dilate
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-            thresh = cv2.dilate(thresh, kernel, iterations=2)
-
-            contours = cv2.findContours(
-                thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-            )
-            contours = imutils.grab_contours(contours)
-
-            motion_detected = False
-            for contour in contours:
-                if cv2.contourArea(contour) < self.config.min_contour_area:
+            self._frame_ready.clear()
+            with self._frame_lock:
+                latest, frame_seq = self._latest_frame, self._frame_seq
+            if latest is None or frame_seq == last_frame_seq:
+                if self._capture_failed:
+                    error_msg = "Could not read frame"
+                    print(f"[ERROR] {error_msg}")
+                    self.notify_error(error_msg, context="motion_detector: read frame")
+                    break
+                continue
+            last_frame_seq = frame_seq
+            frame = last_frame = latest
+
+            # Detect on a subset of frames; the result holds for the frames in
+            # between, while recording still gets every frame. Idle frames are
+            # decimated harder since only the start of motion matters there
+            frame_idx += 1
+            stride = 2 if recording else max(1, self.config.detect_every_n)
+            if frame_idx % stride == 0 or self._avg is None:
+                motion_detected = self._detect_motion(frame)
+                if motion_detected is None:
                     continue
-                motion_detected = True
-                break
 
             current_time = time.time()
 
+            monitoring = self.is_monitoring_hours()
+
             # Only process motion detection during monitoring hours
-            if motion_detected and self.is_monitoring_hours():
+            if motion_detected and monitoring:
                 if not recording:
                     audio_status = "with audio" if AUDIO_AVAILABLE else "video only"
                     print(
@@ -374,25 +859,25 @@ class SecurityMonitor:
 
                     # Modify the motion detection code around line 350 (after saving the first image)
                     # Save start image
-                    start_image_path = str(media_dir / f"start_{timestamp}.jpg")
-                    cv2.imwrite(start_image_path, frame)
-                    self.send_telegram_photo(start_image_path, "🚨 Motion detected! (Start)")
+                    self.send_telegram_photo(frame, "🚨 Motion detected! (Start)")
                     start_image_saved = True
                     first_motion_time = current_time
                     second_image_taken = False
                     
                     # Initialize motion clip recording
-                    motion_frames = [frame.copy()]
+                    # Keep the buffered clip small to bound memory use
+                    clip_size = self._scaled_size(frame, self.CLIP_WIDTH)
+                    motion_frames = [
+                        cv2.resize(frame, clip_size, interpolation=cv2.INTER_AREA)
+                    ]
                     motion_start_time = current_time
 
-                    # Fix: Use proper fourcc code
-                    fourcc = cv2.VideoWriter_fourcc(*"XVID")  # type: ignore
-                    self.out = cv2.VideoWriter(
-                        video_path,
-                        fourcc,
-                        self.config.recording_fps,
-                        (frame.shape[1], frame.shape[0]),
+                    self.out, written_path = self._open_video_writer(
+                        video_path, (frame.shape[1], frame.shape[0])
                     )
+                    if final_path == video_path:
+                        final_path = written_path
+                    video_path = written_path
 
                     # Start audio recording if available
                     if AUDIO_AVAILABLE:
@@ -412,15 +897,13 @@ class SecurityMonitor:
                 
                 # Store frames for the 10-second clip
                 if motion_start_time and (current_time - motion_start_time <= 10.0):
-                    motion_frames.append(frame.copy())
-                    # Add a small delay to control frame rate
-                    time.sleep(1.0 / self.config.recording_fps)
+                    motion_frames.append(
+                        cv2.resize(frame, clip_size, interpolation=cv2.INTER_AREA)
+                    )
                 
                 # Take second image 1 second after motion detection
                 if first_motion_time and not second_image_taken and (current_time - first_motion_time >= 1.0):
-                    second_image_path = str(media_dir / f"second_{timestamp}.jpg")
-                    cv2.imwrite(second_image_path, frame)
-                    self.send_telegram_photo(second_image_path, "🚨 Motion continued! (Second)")
+                    self.send_telegram_photo(frame, "🚨 Motion continued! (Second)")
                     second_image_taken = True
 
                 # Send 3-second clip after we have enough frames
@@ -433,9 +916,9 @@ class SecurityMonitor:
                     # Create video writer for the clip
                     clip_writer = cv2.VideoWriter(
                         clip_path,
-                        cv2.VideoWriter_fourcc(*"XVID"),
+                        self._get_fourcc(),
                         self.config.recording_fps,
-                        (frame.shape[1], frame.shape[0]),
+                        clip_size,
                     )
                     
                     # Write all frames to the clip
@@ -443,15 +926,12 @@ class SecurityMonitor:
                         clip_writer.write(f)
                     clip_writer.release()
                     
-                    # Send the clip to Telegram
-                    self.send_telegram_video(clip_path, "🎥 Motion detected! (First 3 seconds)")
-                    
-                    # Save end image for the clip
-                    end_image_path = str(media_dir / f"clip_end_{clip_timestamp}.jpg")
-                    cv2.imwrite(end_image_path, frame)
-                    
-                    # Clean up the clip file after sending
-                    os.remove(clip_path)
+                    # Send the clip to Telegram; the worker removes it afterwards
+                    self.send_telegram_video(
+                        clip_path,
+                        "🎥 Motion detected! (First 3 seconds)",
+                        delete_after=True,
+                    )
                     
                     telegram_sent = True
 
@@ -459,7 +939,7 @@ class SecurityMonitor:
                     self.out.write(frame)
                 motion_timer = current_time
 
-            elif motion_detected and not self.is_monitoring_hours():
+            elif motion_detected and not monitoring:
                 # Motion detected outside monitoring hours - just show in preview
                 pass
             else:
@@ -512,12 +992,7 @@ class SecurityMonitor:
                     
                     # Send end image if recording has stopped
                     if start_image_saved:
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        media_dir = self.config.get_media_storage_path()
-                        end_image_path = str(media_dir / f"end_{timestamp}.jpg")
-                        cv2.imwrite(end_image_path, frame)
-                        self.send_telegram_photo(end_image_path, "🚨 Motion ended! (End)")
-                        os.remove(end_image_path)
+                        self.send_telegram_photo(frame, "🚨 Motion ended! (End)")
                         start_image_saved = False
 
                     self.out = None
@@ -527,29 +1002,38 @@ class SecurityMonitor:
                     motion_start_time = None
                     motion_frames = []
 
+            # Check for manual photo request
+            if self._manual_photo_requested:
+                self._manual_photo_requested = False
+                self._take_and_send_manual_photo(frame)
+
+            # Daily cleanup of old recordings, never while one is being written
+            if not recording and time.monotonic() >= next_cleanup:
+                next_cleanup = time.monotonic() + self.CLEANUP_INTERVAL
+                try:
+                    self.clean_old_files()
+                except Exception as e:
+                    error_msg = f"Cleanup error: {e}"
+                    print(f"[ERROR] {error_msg}")
+                    self.notify_error(str(e), context="clean_old_files")
+
             # Show preview with status only if not headless
             if not self.config.headless:
                 if self.config.force_monitoring:
                     status_text = "MONITORING FORCED ON"
                     color = (0, 255, 255)  # Cyan for forced mode
-                elif self.is_monitoring_hours():
+                elif monitoring:
                     status_text = "MONITORING ACTIVE"
                     color = (0, 255, 0)  # Green for active
                 else:
                     status_text = "MONITORING INACTIVE"
                     color = (0, 0, 255)  # Red for inactive
             
-                cv2.putText(
-                    frame,
-                    status_text,
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    color,
-                    2,
-                )
-            
-                cv2.imshow("Security Feed", frame)
+                # Draw on a copy, the published frame is shared with /stream
+                preview = frame.copy()
+                self._draw_status(preview, status_text, color)
+
+                cv2.imshow("Security Feed", preview)
                 if cv2.waitKey(1) & 0xFF == ord("q"):
                     break
 
@@ -563,6 +1047,11 @@ class SecurityMonitor:
             if self.audio_thread:
                 self.audio_thread.join(timeout=5)
 
+        # Let the capture thread finish its read before releasing the camera
+        self._capturing = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=2)
+
         if self.cap is not None:
             self.cap.release()
         if not self.config.headless:
@@ -571,20 +1060,14 @@ class SecurityMonitor:
         # In the stop recording block, after sending:
         # Send the final video
         if hasattr(self, "final_path"):
-            self.send_telegram_video(self.final_path, "📹 Full motion recording")
             # Remove the file after upload
-            if os.path.exists(self.final_path):
-                os.remove(self.final_path)
-                print(f"[INFO] Deleted uploaded file: {self.final_path}")
+            self.send_telegram_video(
+                self.final_path, "📹 Full motion recording", delete_after=True
+            )
 
         # Send end image if recording has stopped
-        if start_image_saved:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            media_dir = self.config.get_media_storage_path()
-            end_image_path = str(media_dir / f"end_{timestamp}.jpg")
-            cv2.imwrite(end_image_path, frame)
-            self.send_telegram_photo(end_image_path, "🚨 Motion ended! (End)")
-            os.remove(end_image_path)
+        if start_image_saved and last_frame is not None:
+            self.send_telegram_photo(last_frame, "🚨 Motion ended! (End)")
             start_image_saved = False
 
         self.out = None
@@ -594,14 +1077,9 @@ class SecurityMonitor:
         motion_start_time = None
         motion_frames = []
 
-        # Check for manual photo request
-        if self._manual_photo_requested:
-            self._manual_photo_requested = False
-            self._take_and_send_manual_photo(frame)
-
         # Show preview with status only if not headless
-        if not self.config.headless:
-            cv2.imshow("Security Feed", frame)
+        if not self.config.headless and last_frame is not None:
+            cv2.imshow("Security Feed", last_frame)
             if cv2.waitKey(1) & 0xFF == ord("q"):
                 return
 
@@ -625,20 +1103,8 @@ class SecurityMonitor:
     def _take_and_send_manual_photo(self, frame) -> None:
         """Take a manual photo and send it to Telegram."""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            media_dir = self.config.get_media_storage_path()
-            snapshot_path = str(media_dir / f"manual_peek_{timestamp}.jpg")
-
-            # Save the frame
-            cv2.imwrite(snapshot_path, frame)
-
-            # Send to Telegram
-            self.send_telegram_photo(snapshot_path, "👁️ Manual peek requested!")
-
-            # Clean up the file
-            os.remove(snapshot_path)
-
-            print(f"[INFO] Manual photo taken and sent: {snapshot_path}")
+            self.send_telegram_photo(frame, "👁️ Manual peek requested!")
+            print("[INFO] Manual photo taken and sent")
 
         except Exception as e:
             error_msg = f"Failed to take manual photo: {e}"
@@ -653,6 +1119,7 @@ class SecurityMonitor:
 
         print("[INFO] Starting security monitoring...")
         self.running = True
+        self._stop_event.clear()
 
         # Start Telegram bot handler
         self.telegram_bot = TelegramBotHandler(self.config)
@@ -661,12 +1128,6 @@ class SecurityMonitor:
         # Connect the bot handler to this monitor for manual photo requests
         self.telegram_bot.set_monitor(self)
 
-        # Start cleanup scheduler in background
-        self.cleaner_thread = threading.Thread(
-            target=self.clean_old_files_scheduler, daemon=True
-        )
-        self.cleaner_thread.start()
-
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -685,6 +1146,7 @@ class SecurityMonitor:
 
         print("[INFO] Stopping security monitoring...")
         self.running = False
+        self._stop_event.set()
 
         # Stop Telegram bot handler
         if self.telegram_bot:
@@ -700,10 +1162,31 @@ class SecurityMonitor:
             if self.audio_thread:
                 self.audio_thread.join(timeout=5)
 
+        self._capturing = False
+        if (
+            self._capture_thread is not None
+            and self._capture_thread is not threading.current_thread()
+        ):
+            self._capture_thread.join(timeout=2)
+
         if self.cap is not None:
             self.cap.release()
             self.cap = None
 
+        # Give queued uploads a bounded chance to finish; anything still
+        # running after that is abandoned with its daemon thread
+        deadline = time.monotonic() + self.SHUTDOWN_TIMEOUT
+        with self._tg_lock:
+            workers = list(self._tg_workers.items())
+        for jobs, worker in workers:
+            if worker.is_alive():
+                try:
+                    jobs.put_nowait(None)
+                except queue.Full:
+                    pass
+        for _, worker in workers:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+
         cv2.destroyAllWindows()
         print("[INFO] Security monitoring stopped")
 
@@ -712,1030 +1195,3 @@ class SecurityMonitor:
         print(f"\n[INFO] Received signal {signum}, shutting down...")
         self.stop()
         sys.exit(0)
-
-
-class SecurityMonitor:
-    """Main security monitoring class."""
-
-    def __init__(self, config: Config):
-        self.config = config
-        self.running = False
-        self.cap: Optional[cv2.VideoCapture] = None
-        self.out: Optional[cv2.VideoWriter] = None
-        self.cleaner_thread: Optional[threading.Thread] = None
-        self.audio_recording = False
-        self.audio_thread: Optional[threading.Thread] = None
-        self.telegram_bot: Optional[TelegramBotHandler] = None
-        self._manual_photo_requested = False
-
-    def is_monitoring_hours(self) -> bool:
-        """Check if current time is between monitoring hours."""
-        # If force monitoring is enabled, always return True
-        if self.config.force_monitoring:
-            return True
-
-        current_hour = datetime.now().hour
-        start_hour = self.config.monitoring_start_hour
-        end_hour = self.config.monitoring_end_hour
-
-        if start_hour > end_hour:  # Crosses midnight
-            return current_hour >= start_hour or current_hour < end_hour
-        else:
-            return start_hour <= current_hour < end_hour
-
-    def get_device_identifier(self) -> str:
-        """Get device identifier, using hostname if not specified."""
-        if self.config.device_identifier:
-            return self.config.device_identifier
-        return socket.gethostname()
-
-    def request_manual_photo(self) -> None:
-        """Request a manual photo to be taken and sent."""
-        self._manual_photo_requested = True
-
-    def notify_error(self, error_msg: str, context: str = "") -> None:
-        """Send an error notification to Telegram chat with device identifier."""
-        if self.telegram_bot:
-            device_id = self.get_device_identifier()
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            message = f"❌ <b>Error on {device_id}</b>\n<code>{timestamp}</code>\n<b>Context:</b> {context}\n<b>Details:</b> {error_msg}"
-            try:
-                self.telegram_bot.send_message(message)
-            except Exception as e:
-                print(f"[ERROR] Failed to send Telegram error notification: {e}")
-
-    def send_telegram_photo(self, image_path: str, caption: str = "Motion detected!") -> None:
-        """Send photo to Telegram."""
-        try:
-            device_id = self.get_device_identifier()
-            enhanced_caption = f"🚨 {caption}\n\nDevice: {device_id}\nTime: {datetime.now().strftime('%H:%M:%S')}"
-
-            url = f"https://api.telegram.org/bot{self.config.bot_token}/sendPhoto"
-            with open(image_path, "rb") as photo:
-                files = {"photo": photo}
-                data = {
-                    "chat_id": self.config.chat_id,
-                    "caption": enhanced_caption,
-                }
-                if self.config.topic_id:
-                    data["message_thread_id"] = str(self.config.topic_id)
-
-                response = requests.post(url, files=files, data=data)
-                if response.status_code != 200:
-                    error_msg = f"Telegram send failed: {response.text}"
-                    print(f"[ERROR] {error_msg}")
-                    self.notify_error(error_msg, context="send_telegram_photo")
-        except Exception as e:
-            error_msg = f"Telegram send failed: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="send_telegram_photo")
-
-    def send_telegram_video(self, video_path: str, caption: str = "Motion detected video!") -> None:
-        """Send video to Telegram."""
-        try:
-            device_id = self.get_device_identifier()
-            enhanced_caption = f"🎥 {caption}\n\nDevice: {device_id}\nTime: {datetime.now().strftime('%H:%M:%S')}"
-
-            url = f"https://api.telegram.org/bot{self.config.bot_token}/sendVideo"
-            with open(video_path, "rb") as video:
-                files = {"video": video}
-                data = {
-                    "chat_id": self.config.chat_id,
-                    "caption": enhanced_caption,
-                }
-                if self.config.topic_id:
-                    data["message_thread_id"] = str(self.config.topic_id)
-
-                response = requests.post(url, files=files, data=data)
-                if response.status_code != 200:
-                    error_msg = f"Telegram video send failed: {response.text}"
-                    print(f"[ERROR] {error_msg}")
-                    self.notify_error(error_msg, context="send_telegram_video")
-        except Exception as e:
-            error_msg = f"Telegram video send failed: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="send_telegram_video")
-
-    def clean_old_files(self, days_to_keep: Optional[int] = None) -> None:
-        """Clean old recording files."""
-        if days_to_keep is None:
-            days_to_keep = self.config.cleanup_days
-
-        media_dir = self.config.get_media_storage_path()
-        recording_files = list(media_dir.glob("recording_*.mp4"))
-        temp_video_files = list(media_dir.glob("temp_video_*.avi"))
-        temp_audio_files = list(media_dir.glob("temp_audio_*.wav"))
-
-        # Combine and sort all files by creation time
-        all_files = recording_files + temp_video_files + temp_audio_files
-        all_files.sort(key=lambda x: x.stat().st_ctime)
-
-        current_time = time.time()
-        threshold_time = current_time - (days_to_keep * 24 * 60 * 60)
-
-        for file in all_files:
-            if file.stat().st_ctime < threshold_time:
-                try:
-                    file.unlink()
-                    print(f"[INFO] Removed old file: {file}")
-                except Exception as e:
-                    error_msg = f"Failed to remove {file}: {e}"
-                    print(f"[ERROR] {error_msg}")
-                    self.notify_error(str(e), context=f"clean_old_files: {file}")
-
-    def clean_old_files_scheduler(self) -> None:
-        """Scheduler for cleaning old files."""
-        while self.running:
-            try:
-                now = datetime.now()
-                # Calculate next 6am
-                next_run = now.replace(hour=6, minute=0, second=0, microsecond=0)
-                if now >= next_run:
-                    # If it's already past 6am today, schedule for tomorrow
-                    next_run += timedelta(days=1)
-
-                sleep_seconds = (next_run - now).total_seconds()
-                time.sleep(sleep_seconds)
-
-                if self.running:
-                    self.clean_old_files()
-            except Exception as e:
-                error_msg = f"Cleanup scheduler error: {e}"
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(str(e), context="clean_old_files_scheduler")
-                time.sleep(60)  # Wait a minute before retrying
-
-    def _record_audio(self, audio_path: str) -> None:
-        """Record audio in a separate thread."""
-        if not AUDIO_AVAILABLE:
-            print("[WARNING] Audio recording skipped - sounddevice not available")
-            return
-
-        try:
-            samplerate = 44100
-            channels = 1
-
-            with sf.SoundFile(
-                audio_path, mode="w", samplerate=samplerate, channels=channels
-            ) as file:
-                with sd.InputStream(samplerate=samplerate, channels=channels) as stream:
-                    while self.audio_recording:
-                        data, _ = stream.read(1024)
-                        file.write(data)
-        except Exception as e:
-            error_msg = f"Audio recording failed: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="_record_audio")
-
-    def _merge_audio_video(self) -> None:
-        """Merge audio and video files into a single MP4 file using subprocess and ffmpeg CLI."""
-        import subprocess
-
-        try:
-            print("[INFO] Merging audio and video...")
-
-            # Build ffmpeg command
-            cmd = [
-                "ffmpeg",
-                "-y",  # Overwrite output file if exists
-                "-i",
-                self.video_path,
-                "-i",
-                self.audio_path,
-                "-c:v",
-                "copy",
-                "-c:a",
-                "aac",
-                "-strict",
-                "experimental",
-                self.final_path,
-            ]
-
-            # Run ffmpeg as a subprocess
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-
-            if result.returncode != 0:
-                error_msg = f"ffmpeg failed: {result.stderr}"
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(result.stderr, context="_merge_audio_video")
-                raise RuntimeError("ffmpeg merge failed")
-
-            # Clean up temporary files
-            if os.path.exists(self.video_path):
-                os.remove(self.video_path)
-            if os.path.exists(self.audio_path):
-                os.remove(self.audio_path)
-
-            print(f"[INFO] Created combined recording: {self.final_path}")
-
-        except Exception as e:
-            error_msg = f"Failed to merge audio and video: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="_merge_audio_video")
-            # If merging fails, keep the original files
-            if os.path.exists(self.video_path):
-                os.rename(self.video_path, self.final_path.replace(".mp4", ".avi"))
-
-    def motion_detector(self) -> None:
-        """Main motion detection loop."""
-        # Try to open the webcam, but allow user to grant permission if needed
-        self.cap = None
-        max_wait_time = 60  # seconds to wait for user to allow camera access
-        wait_interval = 2  # seconds between attempts
-        waited = 0
-
-        while self.cap is None or not self.cap.isOpened():
-            if self.cap is not None:
-                self.cap.release()
-            self.cap = cv2.VideoCapture(0)
-            if self.cap.isOpened():
-                break
-            if waited == 0:
-                print(
-                    "[INFO] Waiting for webcam access. Please allow camera permission if prompted..."
-                )
-            time.sleep(wait_interval)
-            waited += wait_interval
-            if waited >= max_wait_time:
-                error_msg = "Could not open webcam after waiting for permission."
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(error_msg, context="motion_detector: webcam access")
-                return
-
-        time.sleep(2)
-
-        avg = None
-        recording = False
-        motion_timer = None
-        telegram_sent = False
-        motion_start_time = None
-        motion_frames = []
-        start_image_saved = False
-        end_image_path = None
-        first_motion_time = None
-        second_image_taken = False
-        start_image_saved = False
-        end_image_path = None
-
-        while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
-                error_msg = "Could not read frame"
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(error_msg, context="motion_detector: read frame")
-                break
-
-            frame = imutils.resize(frame, width=500)
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
-
-            if avg is None:
-                avg = gray.copy().astype("float")
-                continue
-
-            cv2.accumulateWeighted(gray, avg, 0.5)
-            frame_delta = cv2.absdiff(gray, cv2.convertScaleAbs(avg))
-
-            thresh = cv2.threshold(
-                frame_delta, self.config.motion_threshold, 255, cv2.THRESH_BINARY
-            )[1]
-            # Fix: Use proper kernel for dilate
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-            thresh = cv2.dilate(thresh, kernel, iterations=2)
-
-            contours = cv2.findContours(
-                thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-            )
-            contours = imutils.grab_contours(contours)
-
-            motion_detected = False
-            for contour in contours:
-                if cv2.contourArea(contour) < self.config.min_contour_area:
-                    continue
-                motion_detected = True
-                break
-
-            current_time = time.time()
-
-            # Only process motion detection during monitoring hours
-            if motion_detected and self.is_monitoring_hours():
-                if not recording:
-                    audio_status = "with audio" if AUDIO_AVAILABLE else "video only"
-                    print(
-                        f"[INFO] Motion detected during monitoring hours. Starting recording {audio_status}."
-                    )
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-                    media_dir = self.config.get_media_storage_path()
-
-                    if AUDIO_AVAILABLE and FFMPEG_AVAILABLE:
-                        video_path = str(media_dir / f"temp_video_{timestamp}.avi")
-                        audio_path = str(media_dir / f"temp_audio_{timestamp}.wav")
-                        final_path = str(media_dir / f"recording_{timestamp}.mp4")
-                    else:
-                        video_path = str(media_dir / f"recording_{timestamp}.avi")
-                        final_path = video_path
-                        audio_path = ""  # Initialize to avoid unbound error
-
-                    # Modify the motion detection code around line 350 (after saving the first image)
-                    # Save start image
-                    start_image_path = str(media_dir / f"start_{timestamp}.jpg")
-                    cv2.imwrite(start_image_path, frame)
-                    self.send_telegram_photo(start_image_path, "🚨 Motion detected! (Start)")
-                    start_image_saved = True
-                    first_motion_time = current_time
-                    second_image_taken = False
-                    
-                    # Initialize motion clip recording
-                    motion_frames = [frame.copy()]
-                    motion_start_time = current_time
-
-                    # Fix: Use proper fourcc code
-                    fourcc = cv2.VideoWriter_fourcc(*"XVID")  # type: ignore
-                    self.out = cv2.VideoWriter(
-                        video_path,
-                        fourcc,
-                        self.config.recording_fps,
-                        (frame.shape[1], frame.shape[0]),
-                    )
-
-                    # Start audio recording if available
-                    if AUDIO_AVAILABLE:
-                        self.audio_recording = True
-                        self.audio_thread = threading.Thread(
-                            target=self._record_audio, args=(audio_path,), daemon=True
-                        )
-                        self.audio_thread.start()
-
-                        # Store paths for later merging
-                        self.video_path = video_path
-                        self.audio_path = audio_path
-                        self.final_path = final_path
-
-                    recording = True
-                    telegram_sent = False
-                
-                # Store frames for the 10-second clip
-                if motion_start_time and (current_time - motion_start_time <= 10.0):
-                    motion_frames.append(frame.copy())
-                    # Add a small delay to control frame rate
-                    time.sleep(1.0 / self.config.recording_fps)
-                
-                # Take second image 1 second after motion detection
-                if first_motion_time and not second_image_taken and (current_time - first_motion_time >= 1.0):
-                    second_image_path = str(media_dir / f"second_{timestamp}.jpg")
-                    cv2.imwrite(second_image_path, frame)
-                    self.send_telegram_photo(second_image_path, "🚨 Motion continued! (Second)")
-                    second_image_taken = True
-
-                # Send 3-second clip after we have enough frames
-                if motion_start_time and (current_time - motion_start_time > 10.0) and not telegram_sent:
-                    # Create and send the 3-second clip
-                    clip_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    media_dir = self.config.get_media_storage_path()
-                    clip_path = str(media_dir / f"motion_clip_{clip_timestamp}.avi")
-                    
-                    # Create video writer for the clip
-                    clip_writer = cv2.VideoWriter(
-                        clip_path,
-                        cv2.VideoWriter_fourcc(*"XVID"),
-                        self.config.recording_fps,
-                        (frame.shape[1], frame.shape[0]),
-                    )
-                    
-                    # Write all frames to the clip
-                    for f in motion_frames:
-                        clip_writer.write(f)
-                    clip_writer.release()
-                    
-                    # Send the clip to Telegram
-                    self.send_telegram_video(clip_path, "🎥 Motion detected! (First 3 seconds)")
-                    
-                    # Save end image for the clip
-                    end_image_path = str(media_dir / f"clip_end_{clip_timestamp}.jpg")
-                    cv2.imwrite(end_image_path, frame)
-                    
-                    # Clean up the clip file after sending
-                    os.remove(clip_path)
-                    
-                    telegram_sent = True
-
-                if self.out is not None:
-                    self.out.write(frame)
-                motion_timer = current_time
-
-            elif motion_detected and not self.is_monitoring_hours():
-                # Motion detected outside monitoring hours - just show in preview
-                pass
-            else:
-                if (
-                    recording
-                    and motion_timer
-                    and (current_time - motion_timer > self.config.grace_period)
-                ):
-                    print("[INFO] No motion for a while. Stopping recording.")
-                    if self.out is not None:
-                        self.out.release()
-
-                    # Stop audio recording if available
-                    if AUDIO_AVAILABLE and self.audio_recording:
-                        self.audio_recording = False
-                        if self.audio_thread:
-                            self.audio_thread.join(timeout=5)
-
-                    # Merge audio and video into single file if available
-                    if (
-                        AUDIO_AVAILABLE
-                        and FFMPEG_AVAILABLE
-                        and hasattr(self, "video_path")
-                        and hasattr(self, "audio_path")
-                        and hasattr(self, "final_path")
-                    ):
-                        self._merge_audio_video()
-                        # For video-only, transcode to HEVC MKV if FFMPEG_AVAILABLE
-                        if not AUDIO_AVAILABLE and FFMPEG_AVAILABLE and hasattr(self, "video_path") and hasattr(self, "final_path"):
-                            import subprocess
-                            cmd = [
-                                "ffmpeg",
-                                "-y",
-                                "-i",
-                                self.video_path,
-                                "-c:v",
-                                "libx265",
-                                self.final_path,
-                            ]
-                            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                            if result.returncode == 0:
-                                os.remove(self.video_path)
-                            else:
-                                print(f"[ERROR] Failed to transcode to HEVC MKV: {result.stderr}")
-                                self.final_path = self.video_path  # Fallback to AVI
-
-                    # Send the final video (now MKV)
-                    if hasattr(self, "final_path"):
-                        self.send_telegram_video(self.final_path, "📹 Full motion recording")
-                    
-                    # Send end image if recording has stopped
-                    if start_image_saved:
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        media_dir = self.config.get_media_storage_path()
-                        end_image_path = str(media_dir / f"end_{timestamp}.jpg")
-                        cv2.imwrite(end_image_path, frame)
-                        self.send_telegram_photo(end_image_path, "🚨 Motion ended! (End)")
-                        os.remove(end_image_path)
-                        start_image_saved = False
-
-                    self.out = None
-                    recording = False
-                    telegram_sent = False
-                    motion_timer = None
-                    motion_start_time = None
-                    motion_frames = []
-
-            # Show preview with status only if not headless
-            if not self.config.headless:
-                if self.config.force_monitoring:
-                    status_text = "MONITORING FORCED ON"
-                    color = (0, 255, 255)  # Cyan for forced mode
-                elif self.is_monitoring_hours():
-                    status_text = "MONITORING ACTIVE"
-                    color = (0, 255, 0)  # Green for active
-                else:
-                    status_text = "MONITORING INACTIVE"
-                    color = (0, 0, 255)  # Red for inactive
-            
-                cv2.putText(
-                    frame,
-                    status_text,
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    color,
-                    2,
-                )
-            
-                cv2.imshow("Security Feed", frame)
-                if cv2.waitKey(1) & 0xFF == ord("q"):
-                    break
-
-        # Cleanup
-        if recording and self.out is not None:
-            self.out.release()
-
-        # Stop audio recording if still running
-        if AUDIO_AVAILABLE and self.audio_recording:
-            self.audio_recording = False
-            if self.audio_thread:
-                self.audio_thread.join(timeout=5)
-
-        if self.cap is not None:
-            self.cap.release()
-        if not self.config.headless:
-            cv2.destroyAllWindows()
-
-        # In the stop recording block, after sending:
-        # Send the final video
-        if hasattr(self, "final_path"):
-            self.send_telegram_video(self.final_path, "📹 Full motion recording")
-            # Remove the file after upload
-            if os.path.exists(self.final_path):
-                os.remove(self.final_path)
-                print(f"[INFO] Deleted uploaded file: {self.final_path}")
-
-        # Send end image if recording has stopped
-        if start_image_saved:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            media_dir = self.config.get_media_storage_path()
-            end_image_path = str(media_dir / f"end_{timestamp}.jpg")
-            cv2.imwrite(end_image_path, frame)
-            self.send_telegram_photo(end_image_path, "🚨 Motion ended! (End)")
-            os.remove(end_image_path)
-            start_image_saved = False
-
-        self.out = None
-        recording = False
-        telegram_sent = False
-        motion_timer = None
-        motion_start_time = None
-        motion_frames = []
-
-        # Check for manual photo request
-        if self._manual_photo_requested:
-            self._manual_photo_requested = False
-            self._take_and_send_manual_photo(frame)
-
-        # Show preview with status only if not headless
-        if not self.config.headless:
-            cv2.imshow("Security Feed", frame)
-            if cv2.waitKey(1) & 0xFF == ord("q"):
-                return
-
-        # Cleanup
-        if recording and self.out is not None:
-            self.out.release()
-
-        # Stop audio recording if still running
-        if AUDIO_AVAILABLE and self.audio_recording:
-            self.audio_recording = False
-            if self.audio_thread:
-                self.audio_thread.join(timeout=5)
-
-        if self.cap is not None:
-            self.cap.release()
-            self.cap = None
-
-        cv2.destroyAllWindows()
-        print("[INFO] Security monitoring stopped")
-
-    def _take_and_send_manual_photo(self, frame) -> None:
-        """Take a manual photo and send it to Telegram."""
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            media_dir = self.config.get_media_storage_path()
-            snapshot_path = str(media_dir / f"manual_peek_{timestamp}.jpg")
-
-            # Save the frame
-            cv2.imwrite(snapshot_path, frame)
-
-            # Send to Telegram
-            self.send_telegram_photo(snapshot_path, "👁️ Manual peek requested!")
-
-            # Clean up the file
-            os.remove(snapshot_path)
-
-            print(f"[INFO] Manual photo taken and sent: {snapshot_path}")
-
-        except Exception as e:
-            error_msg = f"Failed to take manual photo: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="_take_and_send_manual_photo")
-
-    def start(self) -> None:
-        """Start the security monitoring."""
-        if self.running:
-            print("[INFO] Security monitoring is already running")
-            return
-
-        print("[INFO] Starting security monitoring...")
-        self.running = True
-
-        # Start Telegram bot handler
-        self.telegram_bot = TelegramBotHandler(self.config)
-        self.telegram_bot.start_polling()
-
-        # Connect the bot handler to this monitor for manual photo requests
-        self.telegram_bot.set_monitor(self)
-
-        # Start cleanup scheduler in background
-        self.cleaner_thread = threading.Thread(
-            target=self.clean_old_files_scheduler, daemon=True
-        )
-        self.cleaner_thread.start()
-
-        # Set up signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-
-        try:
-            self.motion_detector()
-        except KeyboardInterrupt:
-            print("\n[INFO] Received interrupt signal")
-        finally:
-            self.stop()
-
-    def stop(self) -> None:
-        """Stop the security monitoring."""
-        if not self.running:
-            return
-
-        print("[INFO] Stopping security monitoring...")
-        self.running = False
-
-        # Stop Telegram bot handler
-        if self.telegram_bot:
-            self.telegram_bot.stop_polling()
-
-        if self.out is not None:
-            self.out.release()
-            self.out = None
-
-        # Stop audio recording if running
-        if AUDIO_AVAILABLE and self.audio_recording:
-            self.audio_recording = False
-            if self.audio_thread:
-                self.audio_thread.join(timeout=5)
-
-        if self.cap is not None:
-            self.cap.release()
-            self.cap = None
-
-        cv2.destroyAllWindows()
-        print("[INFO] Security monitoring stopped")
-
-    def _signal_handler(self, signum, frame) -> None:
-        """Handle shutdown signals."""
-        print(f"\n[INFO] Received signal {signum}, shutting down...")
-        self.stop()
-        sys.exit(0)
-
-
-class SecurityMonitor:
-    """Main security monitoring class."""
-
-    def __init__(self, config: Config):
-        self.config = config
-        self.running = False
-        self.cap: Optional[cv2.VideoCapture] = None
-        self.out: Optional[cv2.VideoWriter] = None
-        self.cleaner_thread: Optional[threading.Thread] = None
-        self.audio_recording = False
-        self.audio_thread: Optional[threading.Thread] = None
-        self.telegram_bot: Optional[TelegramBotHandler] = None
-        self._manual_photo_requested = False
-
-    def is_monitoring_hours(self) -> bool:
-        """Check if current time is between monitoring hours."""
-        # If force monitoring is enabled, always return True
-        if self.config.force_monitoring:
-            return True
-
-        current_hour = datetime.now().hour
-        start_hour = self.config.monitoring_start_hour
-        end_hour = self.config.monitoring_end_hour
-
-        if start_hour > end_hour:  # Crosses midnight
-            return current_hour >= start_hour or current_hour < end_hour
-        else:
-            return start_hour <= current_hour < end_hour
-
-    def get_device_identifier(self) -> str:
-        """Get device identifier, using hostname if not specified."""
-        if self.config.device_identifier:
-            return self.config.device_identifier
-        return socket.gethostname()
-
-    def request_manual_photo(self) -> None:
-        """Request a manual photo to be taken and sent."""
-        self._manual_photo_requested = True
-
-    def notify_error(self, error_msg: str, context: str = "") -> None:
-        """Send an error notification to Telegram chat with device identifier."""
-        if self.telegram_bot:
-            device_id = self.get_device_identifier()
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            message = f"❌ <b>Error on {device_id}</b>\n<code>{timestamp}</code>\n<b>Context:</b> {context}\n<b>Details:</b> {error_msg}"
-            try:
-                self.telegram_bot.send_message(message)
-            except Exception as e:
-                print(f"[ERROR] Failed to send Telegram error notification: {e}")
-
-    def send_telegram_photo(self, image_path: str, caption: str = "Motion detected!") -> None:
-        """Send photo to Telegram."""
-        try:
-            device_id = self.get_device_identifier()
-            enhanced_caption = f"🚨 {caption}\n\nDevice: {device_id}\nTime: {datetime.now().strftime('%H:%M:%S')}"
-
-            url = f"https://api.telegram.org/bot{self.config.bot_token}/sendPhoto"
-            with open(image_path, "rb") as photo:
-                files = {"photo": photo}
-                data = {
-                    "chat_id": self.config.chat_id,
-                    "caption": enhanced_caption,
-                }
-                if self.config.topic_id:
-                    data["message_thread_id"] = str(self.config.topic_id)
-
-                response = requests.post(url, files=files, data=data)
-                if response.status_code != 200:
-                    error_msg = f"Telegram send failed: {response.text}"
-                    print(f"[ERROR] {error_msg}")
-                    self.notify_error(error_msg, context="send_telegram_photo")
-        except Exception as e:
-            error_msg = f"Telegram send failed: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="send_telegram_photo")
-
-    def send_telegram_video(self, video_path: str, caption: str = "Motion detected video!") -> None:
-        """Send video to Telegram."""
-        try:
-            device_id = self.get_device_identifier()
-            enhanced_caption = f"🎥 {caption}\n\nDevice: {device_id}\nTime: {datetime.now().strftime('%H:%M:%S')}"
-
-            url = f"https://api.telegram.org/bot{self.config.bot_token}/sendVideo"
-            with open(video_path, "rb") as video:
-                files = {"video": video}
-                data = {
-                    "chat_id": self.config.chat_id,
-                    "caption": enhanced_caption,
-                }
-                if self.config.topic_id:
-                    data["message_thread_id"] = str(self.config.topic_id)
-
-                response = requests.post(url, files=files, data=data)
-                if response.status_code != 200:
-                    error_msg = f"Telegram video send failed: {response.text}"
-                    print(f"[ERROR] {error_msg}")
-                    self.notify_error(error_msg, context="send_telegram_video")
-        except Exception as e:
-            error_msg = f"Telegram video send failed: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="send_telegram_video")
-
-    def clean_old_files(self, days_to_keep: Optional[int] = None) -> None:
-        """Clean old recording files."""
-        if days_to_keep is None:
-            days_to_keep = self.config.cleanup_days
-
-        media_dir = self.config.get_media_storage_path()
-        recording_files = list(media_dir.glob("recording_*.mp4"))
-        temp_video_files = list(media_dir.glob("temp_video_*.avi"))
-        temp_audio_files = list(media_dir.glob("temp_audio_*.wav"))
-
-        # Combine and sort all files by creation time
-        all_files = recording_files + temp_video_files + temp_audio_files
-        all_files.sort(key=lambda x: x.stat().st_ctime)
-
-        current_time = time.time()
-        threshold_time = current_time - (days_to_keep * 24 * 60 * 60)
-
-        for file in all_files:
-            if file.stat().st_ctime < threshold_time:
-                try:
-                    file.unlink()
-                    print(f"[INFO] Removed old file: {file}")
-                except Exception as e:
-                    error_msg = f"Failed to remove {file}: {e}"
-                    print(f"[ERROR] {error_msg}")
-                    self.notify_error(str(e), context=f"clean_old_files: {file}")
-
-    def clean_old_files_scheduler(self) -> None:
-        """Scheduler for cleaning old files."""
-        while self.running:
-            try:
-                now = datetime.now()
-                # Calculate next 6am
-                next_run = now.replace(hour=6, minute=0, second=0, microsecond=0)
-                if now >= next_run:
-                    # If it's already past 6am today, schedule for tomorrow
-                    next_run += timedelta(days=1)
-
-                sleep_seconds = (next_run - now).total_seconds()
-                time.sleep(sleep_seconds)
-
-                if self.running:
-                    self.clean_old_files()
-            except Exception as e:
-                error_msg = f"Cleanup scheduler error: {e}"
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(str(e), context="clean_old_files_scheduler")
-                time.sleep(60)  # Wait a minute before retrying
-
-    def _record_audio(self, audio_path: str) -> None:
-        """Record audio in a separate thread."""
-        if not AUDIO_AVAILABLE:
-            print("[WARNING] Audio recording skipped - sounddevice not available")
-            return
-
-        try:
-            samplerate = 44100
-            channels = 1
-
-            with sf.SoundFile(
-                audio_path, mode="w", samplerate=samplerate, channels=channels
-            ) as file:
-                with sd.InputStream(samplerate=samplerate, channels=channels) as stream:
-                    while self.audio_recording:
-                        data, _ = stream.read(1024)
-                        file.write(data)
-        except Exception as e:
-            error_msg = f"Audio recording failed: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="_record_audio")
-
-    def _merge_audio_video(self) -> None:
-        """Merge audio and video files into a single MP4 file using subprocess and ffmpeg CLI."""
-        import subprocess
-
-        try:
-            print("[INFO] Merging audio and video...")
-
-            # Build ffmpeg command
-            cmd = [
-                "ffmpeg",
-                "-y",  # Overwrite output file if exists
-                "-i",
-                self.video_path,
-                "-i",
-                self.audio_path,
-                "-c:v",
-                "copy",
-                "-c:a",
-                "aac",
-                "-strict",
-                "experimental",
-                self.final_path,
-            ]
-
-            # Run ffmpeg as a subprocess
-            result = subprocess.run(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-
-            if result.returncode != 0:
-                error_msg = f"ffmpeg failed: {result.stderr}"
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(result.stderr, context="_merge_audio_video")
-                raise RuntimeError("ffmpeg merge failed")
-
-            # Clean up temporary files
-            if os.path.exists(self.video_path):
-                os.remove(self.video_path)
-            if os.path.exists(self.audio_path):
-                os.remove(self.audio_path)
-
-            print(f"[INFO] Created combined recording: {self.final_path}")
-
-        except Exception as e:
-            error_msg = f"Failed to merge audio and video: {e}"
-            print(f"[ERROR] {error_msg}")
-            self.notify_error(str(e), context="_merge_audio_video")
-            # If merging fails, keep the original files
-            if os.path.exists(self.video_path):
-                os.rename(self.video_path, self.final_path.replace(".mp4", ".avi"))
-
-    def motion_detector(self) -> None:
-        """Main motion detection loop."""
-        # Try to open the webcam, but allow user to grant permission if needed
-        self.cap = None
-        max_wait_time = 60  # seconds to wait for user to allow camera access
-        wait_interval = 2  # seconds between attempts
-        waited = 0
-
-        while self.cap is None or not self.cap.isOpened():
-            if self.cap is not None:
-                self.cap.release()
-            self.cap = cv2.VideoCapture(0)
-            if self.cap.isOpened():
-                break
-            if waited == 0:
-                print(
-                    "[INFO] Waiting for webcam access. Please allow camera permission if prompted..."
-                )
-            time.sleep(wait_interval)
-            waited += wait_interval
-            if waited >= max_wait_time:
-                error_msg = "Could not open webcam after waiting for permission."
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(error_msg, context="motion_detector: webcam access")
-                return
-
-        time.sleep(2)
-
-        avg = None
-        recording = False
-        motion_timer = None
-        telegram_sent = False
-        motion_start_time = None
-        motion_frames = []
-        start_image_saved = False
-        end_image_path = None
-        first_motion_time = None
-        second_image_taken = False
-        start_image_saved = False
-        end_image_path = None
-
-        while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
-                error_msg = "Could not read frame"
-                print(f"[ERROR] {error_msg}")
-                self.notify_error(error_msg, context="motion_detector: read frame")
-                break
-
-            frame = imutils.resize(frame, width=500)
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
-
-            if avg is None:
-                avg = gray.copy().astype("float")
-                continue
-
-            cv2.accumulateWeighted(gray, avg, 0.5)
-            frame_delta = cv2.absdiff(gray, cv2.convertScaleAbs(avg))
-
-            thresh = cv2.threshold(
-                frame_delta, self.config.motion_threshold, 255, cv2.THRESH_BINARY
-            )[1]
-            # Fix: Use proper kernel for dilate
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-            thresh = cv2.dilate(thresh, kernel, iterations=2)
-
-            contours = cv2.findContours(
-                thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-            )
-            contours = imutils.grab_contours(contours)
-
-            motion_detected = False
-            for contour in contours:
-                if cv2.contourArea(contour) < self.config.min_contour_area:
-                    continue
-                motion_detected = True
-                break
-
-            current_time = time.time()
-
-            # Only process motion detection during monitoring hours
-            if motion_detected and self.is_monitoring_hours():
-                if not recording:
-                    audio_status = "with audio" if AUDIO_AVAILABLE else "video only"
-                    print(
-                        f"[INFO] Motion detected during monitoring hours. Starting recording {audio_status}."
-                    )
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-                    media_dir = self.config.get_media_storage_path()
-
-                    if AUDIO_AVAILABLE and FFMPEG_AVAILABLE:
-                        video_path = str(media_dir / f"temp_video_{timestamp}.avi")
-                        audio_path = str(media_dir / f"temp_audio_{timestamp}.wav")
-                        final_path = str(media_dir / f"recording_{timestamp}.mp4")
-                    else:
-                        video_path = str(media_dir / f"recording_{timestamp}.avi")
-                        final_path = video_path
-                        audio_path = ""  # Initialize to avoid unbound error
-
-                    # Modify the motion detection code around line 350 (after saving the first image)
-                    # Save start image
-                    start_image_path = str(media_dir / f"start_{timestamp}.jpg")
-                    cv2.imwrite(start_image_path, frame)
-                    self.send_telegram_photo(start_image_path, "🚨 Motion detected! (Start)")
-                    start_image_saved = True
-                    first_motion_time = current_time
-                    second_image_taken = False
-                    
-                    # Initialize motion clip recording
-                    motion_frames = [frame.copy()]
-                    motion_start_time = current_time
-
-                    # Fix: Use proper fourcc code
-                    fourcc = cv2.VideoWriter_fourcc(*"XVID")  # type: ignore
-                    self.out = cv2.VideoWriter(
-                        video_path,
-                        fourcc,
-                        self.config.recording_fps,
-                        (frame.shape[1], frame.shape[0]),
-                    )
-
-                    # Start audio recording if available
-                    if AUDIO_AVAILABLE:
-                        self.audio_recording = True
-                        self.audio_thread = threading.Thread(
-                            target
@@ -11,7 +11,6 @@ from pathlib import Path
 import sys
 import subprocess
 import os
-import cv2
 from .config import Config
 from .updater import SelfUpdater
 
@@ -511,12 +510,9 @@ Current Time: {datetime.now().strftime("%H:%M:%S")}
         
         end_time = time.time() + 300  # 5 minutes
         while time.time() < end_time and self.running:
-            ret, frame = self.monitor.cap.read()
-            if ret:
-                temp_path = "/tmp/stream_frame.jpg"
-                cv2.imwrite(temp_path, frame)
-                self.monitor.send_telegram_photo(temp_path, "Stream frame")
-                os.remove(temp_path)
+            frame = self.monitor.get_latest_frame()
+            if frame is not None:
+                self.monitor.send_telegram_photo(frame, "Stream frame")
             else:
                 self.send_message("Failed to capture frame.")
                 break